@@ -1,7 +1,7 @@
 from typing import TypeVar, Callable
 from datetime import datetime, timedelta, timezone
 from swpt_pythonlib.scan_table import TableScanner
-from sqlalchemy.sql.expression import and_, or_, null, true, false
+from sqlalchemy.sql.expression import and_, or_, null, true, false, select
 from flask import current_app
 from swpt_debtors.extensions import db
 from swpt_debtors.models import Debtor, is_valid_debtor_id
@@ -39,6 +39,9 @@ class DebtorScanner(TableScanner):
         self.max_config_delay = timedelta(
             hours=current_app.config["APP_MAX_CONFIG_DELAY_HOURS"]
         )
+        self.delete_parent_shard_records = current_app.config[
+            "DELETE_PARENT_SHARD_RECORDS"
+        ]
 
     @property
     def blocks_per_query(self) -> int:
@@ -51,47 +54,56 @@ class DebtorScanner(TableScanner):
     @atomic
     def process_rows(self, rows):
         current_ts = datetime.now(tz=timezone.utc)
-        if current_app.config["DELETE_PARENT_SHARD_RECORDS"]:
+        if self.delete_parent_shard_records:
             self._delete_parent_shard_debtors(rows, current_ts)
         self._delete_debtors_not_activated_for_long_time(rows, current_ts)
         self._set_config_errors_if_necessary(rows, current_ts)
 
     def _delete_debtors_not_activated_for_long_time(self, rows, current_ts):
         c = self.table.c
+        c_debtor_id = c.debtor_id
+        c_status_flags = c.status_flags
+        c_created_at = c.created_at
         activated_flag = Debtor.STATUS_IS_ACTIVATED_FLAG
         inactive_cutoff_ts = current_ts - self.inactive_interval
 
         def not_activated_for_long_time(row) -> bool:
             return (
-                row[c.status_flags] & activated_flag == 0
-                and row[c.created_at] < inactive_cutoff_ts
+                row[c_status_flags] & activated_flag == 0
+                and row[c_created_at] < inactive_cutoff_ts
             )
 
         ids_to_delete = [
-            row[c.debtor_id]
+            row[c_debtor_id]
             for row in rows
             if not_activated_for_long_time(row)
         ]
         if ids_to_delete:
-            to_delete = (
-                Debtor.query.filter(Debtor.debtor_id.in_(ids_to_delete))
-                .filter(Debtor.status_flags.op("&")(activated_flag) == 0)
-                .filter(Debtor.created_at < inactive_cutoff_ts)
+            locked_ids = (
+                select(Debtor.debtor_id)
+                .where(Debtor.debtor_id.in_(ids_to_delete))
+                .where(Debtor.status_flags.op("&")(activated_flag) == 0)
+                .where(Debtor.created_at < inactive_cutoff_ts)
                 .with_for_update(skip_locked=True)
-                .all()
             )
-
-            for debtor in to_delete:
-                db.session.delete(debtor)
-
-            db.session.commit()
+            Debtor.query.filter(self.pk.in_(locked_ids)).delete(
+                synchronize_session=False
+            )
 
     def _set_config_errors_if_necessary(self, rows, current_ts):
         c = self.table.c
+        c_debtor_id = c.debtor_id
+        c_status_flags = c.status_flags
+        c_has_server_account = c.has_server_account
+        c_account_last_heartbeat_ts = c.account_last_heartbeat_ts
+        c_is_config_effectual = c.is_config_effectual
+        c_last_config_ts = c.last_config_ts
+        c_config_error = c.config_error
         account_last_heartbeat_ts_cutoff = (
             current_ts - self.max_heartbeat_delay
         )
         last_config_ts_cutoff = current_ts - self.max_config_delay
+        activated_flag = Debtor.STATUS_IS_ACTIVATED_FLAG
         status_flags_mask = (
             Debtor.STATUS_IS_ACTIVATED_FLAG | Debtor.STATUS_IS_DEACTIVATED_FLAG
         )
@@ -99,29 +111,28 @@ class DebtorScanner(TableScanner):
         def has_unreported_config_problem(row) -> bool:
             return (
                 (
-                    not row[c.is_config_effectual]
+                    not row[c_is_config_effectual]
                     or (
-                        row[c.has_server_account]
-                        and row[c.account_last_heartbeat_ts]
+                        row[c_has_server_account]
+                        and row[c_account_last_heartbeat_ts]
                         < account_last_heartbeat_ts_cutoff
                     )
                 )
-                and row[c.config_error] is None
-                and row[c.last_config_ts] < last_config_ts_cutoff
-                and row[c.status_flags] & status_flags_mask
-                == Debtor.STATUS_IS_ACTIVATED_FLAG
+                and row[c_config_error] is None
+                and row[c_last_config_ts] < last_config_ts_cutoff
+                and row[c_status_flags] & status_flags_mask == activated_flag
             )
 
         pks_to_set = [
-            row[c.debtor_id]
+            row[c_debtor_id]
             for row in rows
             if has_unreported_config_problem(row)
         ]
         if pks_to_set:
-            to_update = (
-                db.session.query(Debtor.debtor_id)
-                .filter(self.pk.in_(pks_to_set))
-                .filter(
+            locked_ids = (
+                select(Debtor.debtor_id)
+                .where(self.pk.in_(pks_to_set))
+                .where(
                     or_(
                         Debtor.is_config_effectual == false(),
                         and_(
@@ -131,44 +142,37 @@ class DebtorScanner(TableScanner):
                         ),
                     )
                 )
-                .filter(Debtor.config_error == null())
-                .filter(Debtor.last_config_ts < last_config_ts_cutoff)
-                .filter(
+                .where(Debtor.config_error == null())
+                .where(Debtor.last_config_ts < last_config_ts_cutoff)
+                .where(
                     Debtor.status_flags.op("&")(status_flags_mask)
                     == Debtor.STATUS_IS_ACTIVATED_FLAG
                 )
                 .with_for_update(skip_locked=True, key_share=True)
-                .all()
             )
-
-            if to_update:
-                pks_to_update = [row[0] for row in to_update]
-                Debtor.query.filter(self.pk.in_(pks_to_update)).update(
-                    {Debtor.config_error: "CONFIGURATION_IS_NOT_EFFECTUAL"},
-                    synchronize_session=False,
-                )
-
-            db.session.commit()
+            Debtor.query.filter(self.pk.in_(locked_ids)).update(
+                {Debtor.config_error: "CONFIGURATION_IS_NOT_EFFECTUAL"},
+                synchronize_session=False,
+            )
 
     def _delete_parent_shard_debtors(self, rows, current_ts):
-        c = self.table.c
+        c_debtor_id = self.table.c.debtor_id
 
         def belongs_to_parent_shard(row) -> bool:
-            return not is_valid_debtor_id(
-                row[c.debtor_id]
-            ) and is_valid_debtor_id(row[c.debtor_id], match_parent=True)
+            debtor_id = row[c_debtor_id]
+            return not is_valid_debtor_id(debtor_id) and is_valid_debtor_id(
+                debtor_id, match_parent=True
+            )
 
         ids_to_delete = [
-            row[c.debtor_id] for row in rows if belongs_to_parent_shard(row)
+            row[c_debtor_id] for row in rows if belongs_to_parent_shard(row)
         ]
         if ids_to_delete:
-            to_delete = (
-                Debtor.query.filter(Debtor.debtor_id.in_(ids_to_delete))
+            locked_ids = (
+                select(Debtor.debtor_id)
+                .where(Debtor.debtor_id.in_(ids_to_delete))
                 .with_for_update(skip_locked=True)
-                .all()
             )
-
-            for debtor in to_delete:
-                db.session.delete(debtor)
-
-            db.session.commit()
+            Debtor.query.filter(self.pk.in_(locked_ids)).delete(
+                synchronize_session=False
+            )
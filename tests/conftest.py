@@ -38,13 +38,12 @@ def db_session(app):
 
     # Cleanup:
     db.session.remove()
-    for cmd in [
-        "TRUNCATE TABLE debtor CASCADE",
-        "TRUNCATE TABLE configure_account_signal",
-        "TRUNCATE TABLE prepare_transfer_signal",
-        "TRUNCATE TABLE finalize_transfer_signal",
-    ]:
-        db.session.execute(sqlalchemy.text(cmd))
+    db.session.execute(
+        sqlalchemy.text(
+            "TRUNCATE TABLE debtor, configure_account_signal,"
+            " prepare_transfer_signal, finalize_transfer_signal CASCADE"
+        )
+    )
     db.session.commit()
 
 
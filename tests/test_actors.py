@@ -5,9 +5,14 @@ from swpt_debtors import procedures as p
 
 D_ID = -1
 C_ID = 1
+TS_2019_10_01 = datetime(2019, 10, 1, tzinfo=timezone.utc)
+TS_1970_01_01 = datetime(1970, 1, 1, tzinfo=timezone.utc)
+DATE_2019_10_01 = date(2019, 10, 1)
+DATE_2018_10_01 = date(2018, 10, 1)
+NOW = datetime.now(tz=timezone.utc)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def actors():
     from swpt_debtors import actors
 
@@ -18,13 +23,13 @@ def test_on_rejected_config_signal(db_session, actors):
     actors._on_rejected_config_signal(
         debtor_id=D_ID,
         creditor_id=p.ROOT_CREDITOR_ID,
-        config_ts=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        config_ts=TS_2019_10_01,
         config_seqnum=123,
         negligible_amount=p.HUGE_NEGLIGIBLE_AMOUNT,
         config_data="",
         config_flags=0,
         rejection_code="TEST_REJECTION",
-        ts=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        ts=TS_2019_10_01,
     )
 
 
@@ -33,18 +38,18 @@ def test_on_account_update_signal(db_session, actors):
         debtor_id=D_ID,
         creditor_id=C_ID,
         last_change_seqnum=0,
-        last_change_ts=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        last_change_ts=TS_2019_10_01,
         principal=1000,
         interest_rate=-0.5,
-        last_config_ts=datetime.fromisoformat("1970-01-01T00:00:00+00:00"),
+        last_config_ts=TS_1970_01_01,
         last_config_seqnum=0,
-        creation_date=date.fromisoformat("2018-10-01"),
+        creation_date=DATE_2018_10_01,
         negligible_amount=2.0,
         config_data="",
         config_flags=0,
         account_id="0",
         transfer_note_max_bytes=500,
-        ts=datetime.now(tz=timezone.utc),
+        ts=NOW,
         ttl=1000000,
     )
 
@@ -59,7 +64,7 @@ def test_on_prepared_issuing_transfer_signal(db_session, actors):
         coordinator_request_id=1,
         locked_amount=1000,
         recipient=str(C_ID),
-        prepared_at=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        prepared_at=TS_2019_10_01,
     )
 
 
@@ -84,8 +89,8 @@ def test_on_finalized_issuing_transfer_signal(db_session, actors):
         coordinator_id=D_ID,
         coordinator_request_id=678,
         recipient="1235",
-        prepared_at=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
-        ts=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        prepared_at=TS_2019_10_01,
+        ts=TS_2019_10_01,
         committed_amount=100,
         status_code="OK",
         total_locked_amount=0,
@@ -96,7 +101,7 @@ def test_on_account_purge_signal(db_session, actors):
     actors._on_account_purge_signal(
         debtor_id=D_ID,
         creditor_id=C_ID,
-        creation_date=date.fromisoformat("2019-10-01"),
+        creation_date=DATE_2019_10_01,
     )
 
 
@@ -104,7 +109,7 @@ def test_activate_debtor_signal(db_session, actors):
     actors._on_activate_debtor_signal(
         debtor_id=D_ID,
         reservation_id="test_id",
-        ts=datetime.fromisoformat("2019-10-01T00:00:00+00:00"),
+        ts=TS_2019_10_01,
     )
 
 
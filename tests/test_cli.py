@@ -1,86 +1,97 @@
-import sqlalchemy
+import pytest
 from unittest.mock import Mock
 from uuid import UUID
 from datetime import timedelta
 from swpt_debtors.models import Debtor, FinalizeTransferSignal
 from swpt_debtors.extensions import db
-from swpt_debtors import procedures
 from swpt_pythonlib.utils import ShardingRealm
 
 TEST_UUID = UUID("123e4567-e89b-12d3-a456-426655440000")
 MIN_DEBTOR_ID = 4294967296
-
-
-def _create_new_debtor(debtor_id: int, activate: bool = False):
-    debtor = procedures.reserve_debtor(debtor_id)
-    if activate:
-        procedures.activate_debtor(debtor_id, str(debtor.reservation_id))
-
-
-def test_scan_debtors(app, db_session, current_ts):
-    _create_new_debtor(MIN_DEBTOR_ID + 1, activate=False)
-    _create_new_debtor(MIN_DEBTOR_ID + 2, activate=False)
-    _create_new_debtor(MIN_DEBTOR_ID + 3, activate=True)
-    _create_new_debtor(MIN_DEBTOR_ID + 4, activate=True)
-    _create_new_debtor(MIN_DEBTOR_ID + 5, activate=True)
-    _create_new_debtor(MIN_DEBTOR_ID + 6, activate=True)
-    Debtor.query.filter_by(debtor_id=MIN_DEBTOR_ID + 1).update(
-        {
-            "created_at": current_ts - timedelta(days=30),
-        }
-    )
-    procedures.deactivate_debtor(MIN_DEBTOR_ID + 3)
-    procedures.deactivate_debtor(MIN_DEBTOR_ID + 4)
-    procedures.deactivate_debtor(MIN_DEBTOR_ID + 6)
-    Debtor.query.filter_by(debtor_id=MIN_DEBTOR_ID + 3).update(
-        {
-            "created_at": current_ts - timedelta(days=3000),
-            "deactivation_date": (current_ts - timedelta(days=3000)).date(),
-        }
-    )
-    Debtor.query.filter_by(debtor_id=MIN_DEBTOR_ID + 4).update(
-        {
-            "created_at": current_ts - timedelta(days=3000),
-            "deactivation_date": (current_ts - timedelta(days=300)).date(),
-        }
-    )
-    Debtor.query.filter_by(debtor_id=MIN_DEBTOR_ID + 5).update(
-        {
-            "last_config_ts": current_ts - timedelta(days=3000),
-        }
+SCAN_DEBTORS_ARGS = (
+    "swpt_debtors",
+    "scan_debtors",
+    "--days",
+    "0.000001",
+    "--quit-early",
+)
+
+
+@pytest.fixture(scope="module")
+def cli_runner(app):
+    return app.test_cli_runner()
+
+
+def test_scan_debtors(cli_runner, db_session, current_ts):
+    activated = Debtor.STATUS_IS_ACTIVATED_FLAG
+    deactivated = activated | Debtor.STATUS_IS_DEACTIVATED_FLAG
+    long_ago = current_ts - timedelta(days=3000)
+    db.session.execute(
+        Debtor.__table__.insert(),
+        [
+            {
+                "debtor_id": MIN_DEBTOR_ID + 1,
+                "status_flags": 0,
+                "created_at": current_ts - timedelta(days=30),
+                "deactivation_date": None,
+                "last_config_ts": current_ts,
+            },
+            {
+                "debtor_id": MIN_DEBTOR_ID + 2,
+                "status_flags": 0,
+                "created_at": current_ts,
+                "deactivation_date": None,
+                "last_config_ts": current_ts,
+            },
+            {
+                "debtor_id": MIN_DEBTOR_ID + 3,
+                "status_flags": deactivated,
+                "created_at": long_ago,
+                "deactivation_date": long_ago.date(),
+                "last_config_ts": current_ts,
+            },
+            {
+                "debtor_id": MIN_DEBTOR_ID + 4,
+                "status_flags": deactivated,
+                "created_at": long_ago,
+                "deactivation_date": (current_ts - timedelta(days=300)).date(),
+                "last_config_ts": current_ts,
+            },
+            {
+                "debtor_id": MIN_DEBTOR_ID + 5,
+                "status_flags": activated,
+                "created_at": current_ts,
+                "deactivation_date": None,
+                "last_config_ts": long_ago,
+            },
+            {
+                "debtor_id": MIN_DEBTOR_ID + 6,
+                "status_flags": deactivated,
+                "created_at": current_ts,
+                "deactivation_date": current_ts.date(),
+                "last_config_ts": current_ts,
+            },
+        ],
     )
     db.session.commit()
 
-    assert len(Debtor.query.all()) == 6
+    assert Debtor.query.count() == 6
 
     with db.engine.connect() as conn:
-        conn.execute(sqlalchemy.text("ANALYZE debtor"))
+        conn.exec_driver_sql("ANALYZE debtor")
 
-    runner = app.test_cli_runner()
-    result = runner.invoke(
-        args=[
-            "swpt_debtors",
-            "scan_debtors",
-            "--days",
-            "0.000001",
-            "--quit-early",
-        ]
-    )
+    result = cli_runner.invoke(args=SCAN_DEBTORS_ARGS)
     assert result.exit_code == 0
 
-    debtors = Debtor.query.all()
-    assert len(debtors) == 5
-    assert sorted([d.debtor_id - MIN_DEBTOR_ID for d in debtors]) == [
-        2,
-        3,
-        4,
-        5,
-        6,
-    ]
+    debtors = (
+        db.session.query(Debtor.debtor_id, Debtor.config_error)
+        .order_by(Debtor.debtor_id)
+        .all()
+    )
+    assert [d.debtor_id - MIN_DEBTOR_ID for d in debtors] == [2, 3, 4, 5, 6]
 
     config_errors = {
-        debtor.debtor_id: debtor.config_error
-        for debtor in sorted(debtors, key=lambda d: d.debtor_id)
+        debtor.debtor_id: debtor.config_error for debtor in debtors
     }
     assert (
         config_errors.pop(MIN_DEBTOR_ID + 5)
@@ -89,44 +100,41 @@ def test_scan_debtors(app, db_session, current_ts):
     assert all([v is None for v in config_errors.values()])
 
 
-def test_delete_parent_debtors(app, db_session, current_ts):
-    _create_new_debtor(MIN_DEBTOR_ID, activate=True)
+def test_delete_parent_debtors(app, cli_runner, db_session, current_ts):
+    db.session.execute(
+        Debtor.__table__.insert(),
+        [
+            {
+                "debtor_id": MIN_DEBTOR_ID,
+                "status_flags": Debtor.STATUS_IS_ACTIVATED_FLAG,
+            },
+        ],
+    )
     db.session.commit()
 
     orig_sharding_realm = app.config["SHARDING_REALM"]
     app.config["SHARDING_REALM"] = ShardingRealm("1.#")
     app.config["DELETE_PARENT_SHARD_RECORDS"] = True
-    assert len(Debtor.query.all()) == 1
+    assert Debtor.query.count() == 1
 
     with db.engine.connect() as conn:
-        conn.execute(sqlalchemy.text("ANALYZE debtor"))
+        conn.exec_driver_sql("ANALYZE debtor")
 
-    runner = app.test_cli_runner()
-    result = runner.invoke(
-        args=[
-            "swpt_debtors",
-            "scan_debtors",
-            "--days",
-            "0.000001",
-            "--quit-early",
-        ]
-    )
+    result = cli_runner.invoke(args=SCAN_DEBTORS_ARGS)
     assert result.exit_code == 0
 
-    debtors = Debtor.query.all()
-    assert len(debtors) == 0
+    assert Debtor.query.count() == 0
 
     app.config["DELETE_PARENT_SHARD_RECORDS"] = False
     app.config["SHARDING_REALM"] = orig_sharding_realm
 
 
-def test_flush_messages(mocker, app, db_session):
+def test_flush_messages(mocker, cli_runner, db_session):
     send_signalbus_message = Mock()
     mocker.patch(
         "swpt_debtors.models.FinalizeTransferSignal.send_signalbus_message",
         new_callable=send_signalbus_message,
     )
-    db.session.commit()
     fts = FinalizeTransferSignal(
         creditor_id=0,
         debtor_id=-1,
@@ -139,11 +147,10 @@ def test_flush_messages(mocker, app, db_session):
     )
     db.session.add(fts)
     db.session.commit()
-    assert len(FinalizeTransferSignal.query.all()) == 1
+    assert FinalizeTransferSignal.query.count() == 1
     db.session.commit()
 
-    runner = app.test_cli_runner()
-    result = runner.invoke(
+    result = cli_runner.invoke(
         args=[
             "swpt_debtors",
             "flush_messages",
@@ -155,12 +162,11 @@ def test_flush_messages(mocker, app, db_session):
     )
     assert result.exit_code == 1
     send_signalbus_message.assert_called_once()
-    assert len(FinalizeTransferSignal.query.all()) == 0
+    assert FinalizeTransferSignal.query.count() == 0
 
 
-def test_consume_messages(app):
-    runner = app.test_cli_runner()
-    result = runner.invoke(
+def test_consume_messages(cli_runner):
+    result = cli_runner.invoke(
         args=["swpt_debtors", "consume_messages", "--url=INVALID"]
     )
     assert result.exit_code == 1
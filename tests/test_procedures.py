@@ -63,7 +63,7 @@ def test_deactivate_debtor(debtor):
 
 
 def test_restrict_debtor(debtor):
-    assert len(ConfigureAccountSignal.query.all()) == 0
+    assert ConfigureAccountSignal.query.count() == 0
     assert debtor.min_balance == -9223372036854775808
 
     debtor = p.restrict_debtor(D_ID, -5000)
@@ -79,11 +79,11 @@ def test_restrict_debtor(debtor):
         p.restrict_debtor(D_ID + 1, -6000)
 
     assert debtor.min_balance == -5000
-    assert len(ConfigureAccountSignal.query.all()) == 1
+    assert ConfigureAccountSignal.query.count() == 1
 
 
 def test_process_account_update_signal_no_debtor(db_session, current_ts):
-    assert len(Debtor.query.all()) == 0
+    assert Debtor.query.count() == 0
 
     change_seqnum = 1
     change_ts = datetime.fromisoformat("2019-10-01T00:00:00+00:00")
@@ -105,7 +105,7 @@ def test_process_account_update_signal_no_debtor(db_session, current_ts):
         ts=current_ts,
         ttl=1000000,
     )
-    assert len(Debtor.query.filter_by(debtor_id=D_ID).all()) == 0
+    assert Debtor.query.filter_by(debtor_id=D_ID).count() == 0
     cas = ConfigureAccountSignal.query.one()
     assert cas.debtor_id == D_ID
     assert cas.config_data == ""
@@ -268,12 +268,12 @@ def test_delete_non_existing_initiated_transfer(db_session):
 
 def test_initiate_running_transfer(debtor):
     recipient_uri, recipient = acc_id(D_ID, C_ID)
-    assert len(RunningTransfer.query.all()) == 0
+    assert RunningTransfer.query.count() == 0
     assert p.get_debtor_transfer_uuids(D_ID) == []
     t = p.initiate_running_transfer(
         D_ID, TEST_UUID, recipient_uri, recipient, 1000, "fmt", "test"
     )
-    assert len(RunningTransfer.query.all()) == 1
+    assert RunningTransfer.query.count() == 1
     assert t.debtor_id == D_ID
     assert t.transfer_uuid == TEST_UUID
     assert t.recipient == recipient
@@ -301,10 +301,10 @@ def test_initiate_running_transfer(debtor):
             "test",
         )
     assert len(p.get_debtor_transfer_uuids(D_ID)) == 1
-    assert len(RunningTransfer.query.all()) == 1
+    assert RunningTransfer.query.count() == 1
 
     p.delete_running_transfer(D_ID, TEST_UUID)
-    assert len(RunningTransfer.query.all()) == 0
+    assert RunningTransfer.query.count() == 0
 
 
 def test_too_many_initiated_transfers(debtor):
@@ -322,7 +322,7 @@ def test_too_many_initiated_transfers(debtor):
         )
     )
     db.session.commit()
-    assert len(RunningTransfer.query.all()) == 1
+    assert RunningTransfer.query.count() == 1
     assert p.get_debtor(D_ID).running_transfers_count == 1
     for i in range(1, 10):
         suffix = "{:0>4}".format(i)
@@ -330,7 +330,7 @@ def test_too_many_initiated_transfers(debtor):
         p.initiate_running_transfer(
             D_ID, uuid, *acc_id(D_ID, C_ID), 1000, "", "", 10
         )
-    assert len(RunningTransfer.query.all()) == 10
+    assert RunningTransfer.query.count() == 10
     assert p.get_debtor(D_ID).running_transfers_count == 10
     with pytest.raises(p.TooManyRunningTransfers):
         p.initiate_running_transfer(
@@ -346,7 +346,7 @@ def test_too_many_initiated_transfers(debtor):
 
 def test_successful_transfer(debtor):
     recipient_uri, recipient = acc_id(D_ID, C_ID)
-    assert len(PrepareTransferSignal.query.all()) == 0
+    assert PrepareTransferSignal.query.count() == 0
     p.initiate_running_transfer(
         D_ID, TEST_UUID, recipient_uri, recipient, 1000, "fmt", "test"
     )
@@ -368,7 +368,7 @@ def test_successful_transfer(debtor):
         coordinator_id=D_ID,
         coordinator_request_id=coordinator_request_id,
     )
-    assert len(PrepareTransferSignal.query.all()) == 1
+    assert PrepareTransferSignal.query.count() == 1
     fpts_list = FinalizeTransferSignal.query.all()
     assert len(fpts_list) == 1
     fpts = fpts_list[0]
@@ -420,7 +420,7 @@ def test_rejected_transfer(debtor):
         debtor_id=D_ID,
         creditor_id=p.ROOT_CREDITOR_ID,
     )
-    assert len(FinalizeTransferSignal.query.all()) == 0
+    assert FinalizeTransferSignal.query.count() == 0
 
     it_list = RunningTransfer.query.all()
     assert len(it_list) == 1
@@ -442,7 +442,7 @@ def test_rejected_transfer(debtor):
 
 def test_failed_transfer(debtor):
     recipient_uri, recipient = acc_id(D_ID, C_ID)
-    assert len(PrepareTransferSignal.query.all()) == 0
+    assert PrepareTransferSignal.query.count() == 0
     p.initiate_running_transfer(
         D_ID, TEST_UUID, recipient_uri, recipient, 1000, "fmt", "test"
     )
@@ -464,7 +464,7 @@ def test_failed_transfer(debtor):
         coordinator_id=D_ID,
         coordinator_request_id=coordinator_request_id,
     )
-    assert len(PrepareTransferSignal.query.all()) == 1
+    assert PrepareTransferSignal.query.count() == 1
     fpts_list = FinalizeTransferSignal.query.all()
     assert len(fpts_list) == 1
     fpts = fpts_list[0]
@@ -608,7 +608,7 @@ def test_activate_new_debtor(db_session):
     debtor = p.reserve_debtor(D_ID)
     assert debtor.debtor_id == D_ID
     assert not debtor.is_activated
-    assert len(Debtor.query.all()) == 1
+    assert Debtor.query.count() == 1
     with pytest.raises(p.DebtorExists):
         p.reserve_debtor(D_ID)
 